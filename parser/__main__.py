@@ -6,18 +6,45 @@ This script converts Yahoo Groups messages (from mbox or JSON) into a static web
 """
 
 import argparse
-import mailbox
+import multiprocessing
 import os
 import sys
 import time
-from typing import List, Dict
+from collections import defaultdict
+from typing import List, Dict, Optional, Tuple
 
 from parser.email_json_processor import process_email_json_directory
-from parser.utils import _is_valid_message
+from parser.utils import _is_valid_message, parallel_map
 from .base_message import BaseMessage
 from .generator import SiteGenerator
 from .json_processor import process_json_directory
 from .mbox_message import MboxMessage
+from .mbox_stream import iter_messages
+
+# Minimum number of seconds between progress updates
+PROGRESS_INTERVAL = 0.5
+
+
+def _parse_message(item: Tuple[int, bytes]) -> Tuple[Optional[MboxMessage], Optional[str]]:
+    """Parse a raw mbox entry into a MboxMessage, keeping it only if it is valid.
+
+    Runs in a worker process. Validation happens here so that invalid messages
+    are rejected on their headers alone, without their body being decoded,
+    sanitized or sent back to the parent. Errors are returned rather than raised
+    to keep one bad message from aborting the whole batch.
+
+    Returns:
+        Tuple of (message, error). The message is None if it was invalid or
+        could not be parsed; the error is only set in the latter case.
+    """
+    msg_id, raw = item
+    try:
+        msg = MboxMessage.from_bytes(msg_id, raw)
+        if msg is None or not _is_valid_message(msg):
+            return None, None
+        return msg, None
+    except Exception as e:
+        return None, f"Error processing message {msg_id}: {str(e)}"
 
 
 def process_mbox(mbox_path: str) -> Dict[str, List[BaseMessage]]:
@@ -25,10 +52,10 @@ def process_mbox(mbox_path: str) -> Dict[str, List[BaseMessage]]:
     Process mbox file and return a dictionary where keys are thread names
     and values are lists of Message objects in that thread, sorted by date.
     """
-    threads: Dict[str, List[BaseMessage]] = {}
-    msg_id = 1
+    threads: Dict[str, List[BaseMessage]] = defaultdict(list)
     processed_count = 0
-    start_time = time.time()
+    start_time = time.monotonic()
+    last_update = start_time
 
     if not os.path.exists(mbox_path):
         print(f"Error: File not found: {mbox_path}")
@@ -37,46 +64,39 @@ def process_mbox(mbox_path: str) -> Dict[str, List[BaseMessage]]:
     print("Processing mbox file (this may take a while)...")
 
     try:
-        # Open the mbox file in binary mode and handle encoding at the message level
-        mbox = mailbox.mbox(mbox_path, create=False)
-
-        # Set the default encoding for the mailbox
-        mbox._factory = lambda f, msg=None: mailbox.mboxMessage(f) if msg is None else mailbox.mboxMessage(msg)
-
         invalid_messages = 0
-        total_messages = len(mbox)
-        print(f"Found {total_messages} messages to process")
-
-        for message in mbox:
-            try:
-                msg = MboxMessage(msg_id, message)
-                if _is_valid_message(msg):
-                    if msg.normalized_subject not in threads:
-                        threads[msg.normalized_subject] = []
-                    threads[msg.normalized_subject].append(msg)
-                    processed_count += 1
-                else:
-                    invalid_messages += 1
-
-                msg_id += 1
-
-                processed_count += 1
-
-                # Show progress every 100 messages
-                if processed_count % 100 == 0 or processed_count == total_messages:
-                    elapsed = time.time() - start_time
-                    rate = processed_count / elapsed if elapsed > 0 else 0
-                    print(
-                        f"  Processed {processed_count}/{total_messages} messages "
-                        f"({processed_count / total_messages:.1%}) - {rate:.1f} msg/sec"
-                    )
-
-            except Exception as e:
-                print(f"Error processing message {msg_id}: {str(e)}")
+        # Counting messages up front would take an extra pass over the whole
+        # file, so progress is reported as a running count instead
+        print(f"Reading {os.path.getsize(mbox_path) / (1024 * 1024):.1f} MB of messages")
+
+        # Splitting the file into raw messages is cheap and stays in this process;
+        # the expensive header decoding and HTML sanitizing is spread across worker
+        # processes. IDs are assigned here so they are deterministic regardless of
+        # scheduling.
+        raw_messages = enumerate(iter_messages(mbox_path), 1)
+
+        for msg, error in parallel_map(_parse_message, raw_messages):
+            if error:
+                print(f"\n{error}")
                 continue
 
-        # Remove empty threads (if any)
-        threads = {k: v for k, v in threads.items() if v}
+            if msg:
+                # Messages are unpickled from the workers with their own copy of
+                # every string; sharing them also keeps a single key object per thread
+                msg.share_strings()
+                threads[msg.normalized_subject].append(msg)
+            else:
+                invalid_messages += 1
+
+            processed_count += 1
+
+            # Show progress at most every PROGRESS_INTERVAL seconds, redrawing the same line
+            now = time.monotonic()
+            if now - last_update >= PROGRESS_INTERVAL:
+                last_update = now
+                rate = processed_count / (now - start_time)
+                sys.stdout.write(f"  Processed {processed_count} messages - {rate:.1f} msg/sec\r")
+                sys.stdout.flush()
 
     except Exception as e:
         print(f"Error processing mbox file: {str(e)}")
@@ -85,7 +105,7 @@ def process_mbox(mbox_path: str) -> Dict[str, List[BaseMessage]]:
     total_messages = sum(len(msgs) for msgs in threads.values())
     print(f"\nSuccessfully processed {total_messages} valid messages in {len(threads)} threads")
     print(f"Skipped {invalid_messages} invalid messages")
-    return threads
+    return dict(threads)
 
 
 def main():
@@ -122,4 +142,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Needed for the mbox worker pool when running as a frozen executable on Windows
+    multiprocessing.freeze_support()
     main()
@@ -7,10 +7,20 @@ import re
 from abc import ABC, abstractmethod
 from datetime import datetime
 from email.header import decode_header
+from functools import lru_cache
 from typing import List
 
 from parser.constants import PREFIXES_TO_STRIP
-from parser.message_utils import BRACKET_REGEX, DEFAULT_SUBJECT
+from parser.message_utils import (
+    ATTACHMENT_REGEX,
+    DEFAULT_SUBJECT,
+    SUBJECT_CACHE_SIZE,
+    WAS_REGEX,
+    compile_prefix_regex,
+)
+
+# Longer prefixes come first so the alternation prefers them
+PREFIX_REGEX = compile_prefix_regex(re.escape(p) for p in sorted(PREFIXES_TO_STRIP, key=len, reverse=True))
 
 
 class BaseMessage(ABC):
@@ -19,7 +29,12 @@ class BaseMessage(ABC):
     This class defines the interface that all message implementations must follow.
     """
 
+    # Large archives keep every message in memory at once, so subclasses declare
+    # __slots__ too instead of giving each instance a __dict__
+    __slots__ = ()
+
     @staticmethod
+    @lru_cache(maxsize=SUBJECT_CACHE_SIZE)
     def _decode_mime_header(header: str) -> str:
         """Decode MIME-encoded header values."""
         if not header:
@@ -49,6 +64,7 @@ class BaseMessage(ABC):
             return str(header).lstrip("_").strip()
 
     @staticmethod
+    @lru_cache(maxsize=SUBJECT_CACHE_SIZE)
     def _normalize_subject(subject: str) -> str:
         """Normalize thread subject by:
         1. Decoding MIME-encoded parts
@@ -65,32 +81,15 @@ class BaseMessage(ABC):
         subject = BaseMessage._decode_mime_header(subject)
 
         # Extract content from parenthetical references like "... (was Original Subject)"
-        match = re.search(r"\(\s*was\s+([^)]*)\)", subject, flags=re.IGNORECASE)
+        match = WAS_REGEX.search(subject)
         if match:
             subject = match.group(1).strip()
 
         # Remove any attachment indicators from the end (e.g., [1 Attachment], [2 Attachments], etc.)
-        subject = re.sub(r"\s*\[\s*\d+\s+Attachments?\s*]\s*$", "", subject, flags=re.IGNORECASE)
-
-        # Process prefixes and other normalizations
-        stripped = True
-        while stripped:
-            stripped = False
-
-            # Remove [bracketed] prefixes
-            subject = re.sub(BRACKET_REGEX, "", subject)
+        subject = ATTACHMENT_REGEX.sub("", subject)
 
-            # Check for and remove reply/forward prefixes (Re:, Fwd:, etc.)
-            lower_subject = subject.lower()
-            for p in PREFIXES_TO_STRIP:
-                if lower_subject.startswith(p.lower()):
-                    subject = subject[len(p):].lstrip()  # remove the prefix + leading spaces
-                    stripped = True
-                    break  # check prefixes again from the start
-
-            # If we still have [bracketed] content, strip it in the next iteration
-            if re.match(BRACKET_REGEX, subject):
-                stripped = True
+        # Remove any run of reply/forward prefixes (Re:, Fwd:, etc.) and [bracketed] prefixes
+        subject = PREFIX_REGEX.sub("", subject, count=1)
 
         subject = subject.strip()
 
@@ -132,11 +131,38 @@ class BaseMessage(ABC):
         """Return the message date as a timezone-aware datetime object."""
         pass
     
+    @property
+    @abstractmethod
+    def timestamp(self) -> int:
+        """Return the message date as a Unix timestamp, or 0 if there is no date.
+
+        Cheaper to compare than datetimes, so this is the sort key for messages.
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def date_str(self) -> str:
+        """Return the message date formatted for display, or "" if there is no date."""
+        pass
+
+    @property
+    @abstractmethod
+    def month_year(self) -> str:
+        """Return the month and year of the message date (e.g. "March 2004"), or "" if there is no date."""
+        pass
+
     @property
     @abstractmethod
     def html_content(self) -> str:
         """Return the HTML content of the message."""
         pass
+
+    @property
+    @abstractmethod
+    def text_content(self) -> str:
+        """Return the plain-text content of the message (HTML tags stripped)."""
+        pass
     
     @property
     @abstractmethod
@@ -155,3 +181,12 @@ class BaseMessage(ABC):
     def url(self, value: str) -> None:
         """Set the relative URL to this message's page."""
         pass
+
+    @abstractmethod
+    def share_strings(self) -> None:
+        """Replace this message's strings with shared copies of equal ones seen before.
+
+        Call this in the main process on messages returned by worker processes,
+        which come back with their own copy of every string.
+        """
+        pass
@@ -9,12 +9,16 @@ import json
 import os
 import sys
 import time
-from datetime import datetime
-from typing import Dict, List, Tuple
+from collections import defaultdict
+from operator import attrgetter
+from typing import Dict, List, Optional, Tuple
 
 from .base_message import BaseMessage
 from .json_message import JSONMessage
-from .utils import _is_valid_message
+from .utils import _is_valid_message, find_numbered_json_files, load_json_file, parallel_map
+
+# Line drawn above and below the final report
+REPORT_RULE = "=" * 80
 
 
 class ProgressTracker:
@@ -23,6 +27,8 @@ class ProgressTracker:
     def __init__(self, total_files: int, threads: Dict[str, List[BaseMessage]]):
         """Initialize with the total number of files to process and threads dict."""
         self.total_files = total_files
+        # Multiplied by instead of divided by on every status update
+        self._total_files_inv = 1.0 / total_files if total_files else 0.0
         self.threads = threads
         self.processed_files = 0
         self.processed_messages = 0
@@ -33,7 +39,7 @@ class ProgressTracker:
     def update_file_started(self, filename: str) -> None:
         """Called when starting to process a new file."""
         self.processed_files += 1
-        self._print_status(f"Processing {filename}...")
+        self._print_status(filename)
         
     def update_messages_processed(self, count: int, valid: int) -> None:
         """Update the count of processed and valid messages."""
@@ -41,27 +47,26 @@ class ProgressTracker:
         self.valid_messages += valid
         self._print_status()
         
-    def _print_status(self, message: str = None) -> None:
+    def _print_status(self, filename: Optional[str] = None) -> None:
         """Print the current status, but not too frequently."""
+        # Checked before any formatting, since this runs once or twice for every file
         current_time = time.time()
-        if current_time - self.last_update < 5.0 and not message:
+        if current_time - self.last_update < 5.0:
             return
             
         self.last_update = current_time
         elapsed = current_time - self.start_time
         rate = self.processed_messages / elapsed if elapsed > 0 else 0
         
-        status_lines = []
-        if message:
-            status_lines.append(message)
-            
-        status_lines.extend([
-            f"Files: {self.processed_files}/{self.total_files} "
-            f"({self.processed_files/self.total_files:.1%})",
-            f"Messages: {self.processed_messages} processed, "
-            f"{self.valid_messages} valid ({rate:.1f} msg/sec)",
-            f"Elapsed: {self._format_duration(elapsed)}"
-        ])
+        files_line = (f"Files: {self.processed_files}/{self.total_files} "
+                      f"({self.processed_files * self._total_files_inv:.1%})")
+        messages_line = (f"Messages: {self.processed_messages} processed, "
+                         f"{self.valid_messages} valid ({rate:.1f} msg/sec)")
+        elapsed_line = f"Elapsed: {self._format_duration(elapsed)}"
+        if filename:
+            status_lines = (f"Processing {filename}...", files_line, messages_line, elapsed_line)
+        else:
+            status_lines = (files_line, messages_line, elapsed_line)
         
         # Clear previous status if this isn't the first update
         if self.processed_files > 1 or self.processed_messages > 0:
@@ -76,14 +81,17 @@ class ProgressTracker:
         rate = self.processed_messages / elapsed if elapsed > 0 else 0
         thread_count = len(self.threads)
         
-        print("\n" + "=" * 80)
-        print(f"Processing complete!")
-        print(f"- Processed {self.processed_files} files")
-        print(f"- Processed {self.processed_messages} total messages")
-        print(f"- Found {self.valid_messages} valid messages in {thread_count} threads")
-        print(f"- Average speed: {rate:.1f} messages/second")
-        print(f"- Total time: {self._format_duration(elapsed)}")
-        print("=" * 80)
+        # Written with a single print, so the report isn't interleaved with other output
+        print("\n".join((
+            "\n" + REPORT_RULE,
+            "Processing complete!",
+            f"- Processed {self.processed_files} files",
+            f"- Processed {self.processed_messages} total messages",
+            f"- Found {self.valid_messages} valid messages in {thread_count} threads",
+            f"- Average speed: {rate:.1f} messages/second",
+            f"- Total time: {self._format_duration(elapsed)}",
+            REPORT_RULE,
+        )))
         
         return self.valid_messages, thread_count, elapsed
     
@@ -101,6 +109,36 @@ class ProgressTracker:
             return f"{seconds}s"
 
 
+def _parse_message_file(item: Tuple[str, str]) -> Tuple[Optional[JSONMessage], int, Optional[str]]:
+    """Load a message file and parse it, keeping the message only if it is valid.
+
+    Runs in a worker process. Problems are returned rather than printed, so the
+    parent can report them in file order.
+
+    Returns:
+        Tuple of (message, number of messages read, problem). The message is None
+        if it was invalid or could not be parsed.
+    """
+    filename, file_path = item
+    try:
+        data = load_json_file(file_path)
+    except (json.JSONDecodeError, OSError) as e:
+        return None, 0, f"Error reading {filename}: {e}"
+
+    try:
+        msg_id = int(data.get('msgId', '0'))
+        if not msg_id:
+            return None, 0, f"Warning: Missing or invalid msgId in {filename}"
+
+        msg = JSONMessage(msg_id, data)
+        if not _is_valid_message(msg):
+            return None, 1, None
+        return msg, 1, None
+
+    except (KeyError, ValueError) as e:
+        return None, 1, f"Error processing message in {filename}: {e}"
+
+
 def process_email_json_directory(json_dir: str) -> Dict[str, List[BaseMessage]]:
     """
     Process a directory containing JSON files and return a dictionary where keys are 
@@ -113,81 +151,58 @@ def process_email_json_directory(json_dir: str) -> Dict[str, List[BaseMessage]]:
     Returns:
         Dictionary mapping thread names to lists of BaseMessage objects
     """
-    threads: Dict[str, List[BaseMessage]] = {}
+    threads: Dict[str, List[BaseMessage]] = defaultdict(list)
 
     if not os.path.isdir(json_dir):
         raise FileNotFoundError(f"Directory not found: {json_dir}")
 
     # Get list of JSON files to process
-    json_files = [f for f in os.listdir(json_dir) 
-                 if f.endswith('.json') and f[:-5].isdigit()]
+    json_files = find_numbered_json_files(json_dir)
     
     if not json_files:
         print(f"No valid JSON files found in {json_dir}")
-        return threads
+        return {}
         
     print(f"Found {len(json_files)} JSON files to process in {json_dir}...")
     progress = ProgressTracker(len(json_files), threads)
 
-    total_messages = 0
-    valid_messages = 0
-
-    # Process each JSON file in the directory that matches <integer>.json pattern
-    for filename in sorted(json_files, key=lambda x: int(x[:-5])):
-        file_path = os.path.join(json_dir, filename)
+    # Files are loaded and parsed in worker processes; results come back in file order
+    results = parallel_map(_parse_message_file, json_files)
+    for (filename, _), (msg, message_count, problem) in zip(json_files, results):
         progress.update_file_started(filename)
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            try:
-                msg_id = int(data.get('msgId', '0'))
-                if not msg_id:
-                    print(f"\nWarning: Missing or invalid msgId in {filename}")
-                    continue
-                total_messages += 1
-
-                msg = JSONMessage(msg_id, data)
-                if not _is_valid_message(msg):
-                    continue
-
-                valid_messages += 1
-
-                # Group by topic_id
-                topic_id = msg.topic_id or f'single_{msg.id}'
-                if topic_id not in threads:
-                    threads[topic_id] = []
-                threads[topic_id].append(msg)
-
-            except (KeyError, ValueError) as e:
-                print(f"\nError processing message in {filename}: {e}")
-                continue
-                    
-            progress.update_messages_processed(total_messages, valid_messages)
-
-        except (json.JSONDecodeError, OSError) as e:
-            print(f"\nError reading {filename}: {e}")
-            continue
+
+        if problem:
+            print(f"\n{problem}")
+
+        if msg:
+            msg.share_strings()
+            # Group by topic_id
+            topic_id = msg.topic_id or f'single_{msg.id}'
+            threads[topic_id].append(msg)
+
+        progress.update_messages_processed(message_count, 1 if msg else 0)
 
     # Sort messages in each thread by date and update thread names with first message's subject
     updated_threads = {}
+    # Next suffix to try for each subject, so many threads sharing a subject don't re-probe every taken name
+    next_suffix: Dict[str, int] = {}
     for topic_id, messages in threads.items():
-        # Sort messages by date
-        messages_sorted = sorted(messages, key=lambda x: x.date if x.date else datetime.min)
+        # Sort messages by date, in place; files mostly arrive in date order, so this is close to linear
+        messages.sort(key=attrgetter("timestamp"))
         
         # Use the first message's subject as the thread name
-        if messages_sorted and messages_sorted[0].subject:
-            thread_name = messages_sorted[0].subject
+        base_name = messages[0].subject if messages else None
+        if base_name:
+            thread_name = base_name
             # Ensure thread name is unique
-            base_name = thread_name
-            counter = 1
+            counter = next_suffix.get(base_name, 1)
             while thread_name in updated_threads:
                 thread_name = f"{base_name} ({counter})"
                 counter += 1
-            updated_threads[thread_name] = messages_sorted
+            next_suffix[base_name] = counter
+            updated_threads[thread_name] = messages
         else:
-            updated_threads[f"Thread {topic_id}"] = messages_sorted
+            updated_threads[f"Thread {topic_id}"] = messages
     
     threads = updated_threads
 
@@ -2,18 +2,42 @@
 HTML generation utilities for the Yahoo Groups Mbox to Static Website Converter.
 """
 
-import json
+import gzip
+import re
+import shutil
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from html import escape
+from itertools import groupby
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from bs4 import BeautifulSoup
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
-from . import constants
 from .base_message import BaseMessage
-from .utils import slugify
+from .utils import dump_json_bytes, slugify
+
+# CSS and JavaScript shipped with the package, copied as-is into every site
+STATIC_ASSETS_DIR = Path(__file__).parent / "static"
+# Service worker caching the search index; it goes next to the search page rather
+# than into static/, since a service worker only covers pages at or below its own path
+SEARCH_SW_ASSET = STATIC_ASSETS_DIR / "search-sw.js"
+
+# Characters replaced with "_" in thread page file names: anything but letters, digits, spaces, "-" and "_"
+UNSAFE_FILENAME_CHARS_REGEX = re.compile(r"[^\w \-]")
+
+# Columns of search_index.json; each maps to a list with one value per thread, newest thread first
+SEARCH_INDEX_COLUMNS = (
+    "url_html",
+    "title_html",
+    "authors_html",
+    "message_count",
+    "start_date_ts",
+    "last_date_ts",
+    "search_text",
+)
 
 
 class SiteGenerator:
@@ -47,10 +71,10 @@ class SiteGenerator:
         for directory in [self.output_dir, self.messages_dir, self.static_dir, self.search_dir]:
             directory.mkdir(parents=True, exist_ok=True)
 
-        # Set up template environment
-        self.env = Environment(
-            loader=FileSystemLoader(Path(__file__).parent / "templates"), autoescape=select_autoescape(["html", "xml"])
-        )
+        # Set up template environment, compiling page templates once up front
+        self.env = _template_environment()
+        self.index_template = self.env.get_template("index.html")
+        self.search_template = self.env.get_template("search.html")
 
     def generate_site(self, threads: dict[str, List[BaseMessage]]) -> None:
         """
@@ -62,9 +86,7 @@ class SiteGenerator:
         print("\nGenerating static website...")
         start_time = time.time()
 
-        # Flatten messages list for compatibility with existing code
-        all_messages = [msg for thread_msgs in threads.values() for msg in thread_msgs]
-        total_messages = len(all_messages)
+        total_messages = sum(len(thread_msgs) for thread_msgs in threads.values())
 
         # Copy static files
         print("Copying static files...")
@@ -75,19 +97,32 @@ class SiteGenerator:
         generated_count = 0
         processed_messages = 0
 
-        for i, (thread_name, messages) in enumerate(threads.items(), 1):
-            self._generate_thread_page(messages, i)
-            processed_messages += len(messages)
-            generated_count += 1
-
-            # Show progress every 10 threads
-            if i % 10 == 0 or i == len(threads):
-                elapsed = time.time() - start_time
-                rate = processed_messages / elapsed if elapsed > 0 else 0
-                print(
-                    f"  Processed {i}/{len(threads)} threads "
-                    f"({processed_messages}/{total_messages} messages) - {rate:.1f} msg/sec"
-                )
+        # Each thread page is independent, so render and write them concurrently;
+        # much of the work is file I/O and C-level escaping that releases the GIL.
+        # Worker processes would have to be sent every message body only to render
+        # one template each, which measured slower. File names and message URLs are
+        # assigned here as pages are handed out, so the workers never modify messages.
+        # Results come back in order, which keeps the progress output unchanged.
+        # The search index entries are collected in the same pass over the messages.
+        search_entries = []
+        pages = (
+            self._prepare_thread_page(thread_name, thread, thread_id, search_entries)
+            for thread_id, (thread_name, thread) in enumerate(threads.items(), 1)
+        )
+        with ThreadPoolExecutor() as executor:
+            written = executor.map(_write_thread_page, pages)
+            for i, (messages, _) in enumerate(zip(threads.values(), written), 1):
+                processed_messages += len(messages)
+                generated_count += 1
+
+                # Show progress every 10 threads
+                if i % 10 == 0 or i == len(threads):
+                    elapsed = time.time() - start_time
+                    rate = processed_messages / elapsed if elapsed > 0 else 0
+                    print(
+                        f"  Processed {i}/{len(threads)} threads "
+                        f"({processed_messages}/{total_messages} messages) - {rate:.1f} msg/sec"
+                    )
 
         # Generate paginated index pages
         print("\nGenerating index pages...")
@@ -95,8 +130,15 @@ class SiteGenerator:
         threads_per_page = 25
         total_pages = (total_threads + threads_per_page - 1) // threads_per_page
 
+        # Sort the threads by the date of their first message once, newest first, for all pages
+        sorted_threads = sorted(
+            threads.items(),
+            key=lambda x: x[1][0].timestamp if x[1] else 0,
+            reverse=True
+        )
+
         for page in range(1, total_pages + 1):
-            self._generate_index_page(threads, page, threads_per_page)
+            self._generate_index_page(sorted_threads, total_messages, page, threads_per_page)
             if page == 1:
                 print(f"  Generated index.html (page 1 of {total_pages})")
             else:
@@ -104,137 +146,79 @@ class SiteGenerator:
 
         # Generate search index
         print("Generating search index...")
-        self._generate_search_index(threads)
+        self._generate_search_index(search_entries)
 
         elapsed = time.time() - start_time
         print(f"\nWebsite generation completed in {elapsed:.1f} seconds")
         print(f"Total pages generated: {generated_count} thread pages + index + search")
 
     def _copy_static_files(self) -> None:
-        """Copy static files (CSS, JS) to the output directory."""
-        # Write CSS file
-        with open(self.static_dir / "style.css", "w", encoding="utf-8") as f:
-            f.write(constants.CSS_STYLES)
-
-        # Write JavaScript file
-        with open(self.static_dir / "script.js", "w", encoding="utf-8") as f:
-            f.write(constants.JAVASCRIPT_CODE)
+        """Copy static files (CSS, JS) to the output directory, along with gzipped copies
+        that servers with static gzip support can send as-is."""
+        for asset in STATIC_ASSETS_DIR.iterdir():
+            if asset == SEARCH_SW_ASSET:
+                continue
+            data = asset.read_bytes()
+            (self.static_dir / asset.name).write_bytes(data)
+            (self.static_dir / f"{asset.name}.gz").write_bytes(gzip.compress(data, 9, mtime=0))
+
+    def _prepare_thread_page(
+        self,
+        thread_name: str,
+        thread: List[BaseMessage],
+        thread_id: int,
+        search_entries: List[Tuple[int, tuple]],
+    ) -> Optional[Tuple[List[BaseMessage], str, str, Path]]:
+        """Pick the file name for a thread's page and point its messages' URLs at it.
+
+        Also appends the thread's search index entry, as (first message timestamp,
+        row in SEARCH_INDEX_COLUMNS order), to search_entries.
 
-    @staticmethod
-    def _clean_html_content(html: str) -> str:
-        """Clean up HTML content to ensure consistent styling."""
-        if not html:
-            return ""
-            
-        # Parse the HTML with BeautifulSoup
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Remove any inline styles and classes
-        for tag in soup.find_all(True):
-            # Remove style attributes
-            if 'style' in tag.attrs:
-                del tag.attrs['style']
-                
-            # Remove class attributes from most elements (keep our utility classes)
-            if 'class' in tag.attrs and tag.name not in ['div', 'span']:
-                del tag.attrs['class']
-                
-            # Remove font tags
-            if tag.name == 'font':
-                tag.unwrap()
-                
-        # Convert back to string
-        return str(soup)
-
-    def _generate_thread_page(self, thread: List[BaseMessage], thread_id: int) -> None:
-        """Generate an HTML page for a single thread."""
+        Returns:
+            The arguments for _write_thread_page(), or None for an empty thread
+        """
         if not thread:
-            return
+            return None
 
         # Sort messages in thread by date (oldest first)
-        thread.sort(key=lambda x: x.date)
-
-        # Generate HTML for each message in the thread
-        messages_html = ""
-        for i, message in enumerate(thread, 1):
-            # Get the already cleaned HTML content
-            cleaned_content = message.html_content
-            
-            # Format the message date
-            message_date = message.date.strftime('%Y-%m-%d %H:%M:%S %Z') if message.date else 'Unknown date'
-            
-            # Format the sender info
-            sender_str = self._get_sender_str(message)
-            
-            messages_html += f"""
-            <div class="message {'first-message' if i == 1 else 'reply-message'}">
-                <div class="message-header">
-                    <h3 class="message-subject">{self._escape_html(message.subject)}</h3>
-                    <div class="message-meta">
-                        From: <strong>{sender_str}</strong> | 
-                        Date: {message_date}
-                    </div>
-                </div>
-                <div class="message-content">
-                    {cleaned_content}
-                </div>
-            </div>
-            """
-
-        # Create the complete HTML
+        thread.sort(key=attrgetter("timestamp"))
+
         thread_subject = thread[0].normalized_subject or "No subject"
-        html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>{self._escape_html(thread_subject)} - Thread - {self.forum_name} Archive</title>
-            <link rel="stylesheet" href="../static/style.css">
-        </head>
-        <body>
-            <header>
-                <h1>{self.forum_name} - Yahoo Groups Archive</h1>
-                <nav>
-                    <a href="../index.html">Back to Index</a>
-                </nav>
-            </header>
-            
-            <main>
-                <h1 class="thread-title">{self._escape_html(thread_subject)}</h1>
-                <div class="thread-meta">
-                    {len(thread)} messages in this thread | 
-                    Started on {thread[0].date.strftime('%Y-%m-%d')}
-                </div>
-                
-                <div class="thread-messages">
-                    {messages_html}
-                </div>
-            </main>
-            
-            <footer>
-                <p>Generated by Yahoo Groups Mbox to Static Website Converter</p>
-            </footer>
-            
-            <script src="../static/script.js"></script>
-        </body>
-        </html>
-        """
 
         # Create a URL-friendly filename for the thread
-        safe_subject = "".join(c if c.isalnum() or c in " -_" else "_" for c in thread_subject)
-        safe_subject = safe_subject[:50]  # Limit length
+        # (one character is replaced by one, so the length can be limited first)
+        safe_subject = UNSAFE_FILENAME_CHARS_REGEX.sub("_", thread_subject[:50])
         filename = f"thread_{thread_id}_{safe_subject}.html"
 
-        # Write to file
-        output_file = self.messages_dir / filename
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(html)
-
-        # Update the URL for all messages in this thread
+        # Update the URL for all messages in this thread, collecting the unique authors
+        # in order of their first message (a dict keeps insertion order)
+        url = f"messages/{filename}"
+        authors = {}
         for msg in thread:
-            msg.url = f"messages/{filename}"
+            msg.url = url
+            if msg.sender_name:
+                authors[msg.sender_name] = None
+
+        # Add simplified thread information with dates, in SEARCH_INDEX_COLUMNS order.
+        # Displayed fields are HTML-escaped once here, so the search scripts can insert them as-is.
+        search_entries.append((
+            thread[0].timestamp,
+            (
+                escape(f"../{url}"),  # Add ../ to go up from search/ to root
+                escape(thread_name),
+                escape(", ".join(authors)),
+                len(thread),
+                # Unix timestamps are shorter than ISO dates and need no parsing in the browser;
+                # 0 means the date is unknown
+                thread[0].timestamp,
+                thread[-1].timestamp,
+                # Lowercased once here so the search scripts don't have to on every query.
+                # Fields are separated by a newline, which a search query can't contain.
+                "\n".join([thread_name, *authors]).lower(),
+            ),
+        ))
+
+        return thread, thread_subject, self.forum_name, self.messages_dir / filename
 
     @staticmethod
     def _get_sender_str(message: BaseMessage) -> str:
@@ -251,23 +235,21 @@ class SiteGenerator:
         return sender_str
 
     def _generate_index_page(
-        self, threads: dict[str, List[BaseMessage]], page: int = 1, threads_per_page: int = 25
+        self,
+        sorted_threads: List[Tuple[str, List[BaseMessage]]],
+        total_messages: int,
+        page: int = 1,
+        threads_per_page: int = 25,
     ) -> None:
         """
         Generate the main index page with paginated threads.
 
         Args:
-            threads: Dictionary where keys are thread names and values are lists of messages
+            sorted_threads: (thread name, messages) pairs, newest thread first
+            total_messages: Number of messages in all threads
             page: Current page number (1-based)
             threads_per_page: Number of threads to display per page
         """
-        # Convert threads to a list and sort by the date of the first message
-        sorted_threads = sorted(
-            threads.items(), 
-            key=lambda x: x[1][0].date if x[1] and x[1][0].date else datetime.min, 
-            reverse=True
-        )
-
         # Calculate pagination
         total_threads = len(sorted_threads)
         total_pages = (total_threads + threads_per_page - 1) // threads_per_page
@@ -278,163 +260,68 @@ class SiteGenerator:
         # Get threads for current page
         page_threads = sorted_threads[start_idx:end_idx]
 
-        # Group threads by month for better organization
-        threads_by_month = {}
-        for thread_name, messages in page_threads:
-            if not messages:
-                continue
-
-            # Get the first message date for grouping
-            first_message = messages[0]
-            if not first_message.date:
-                continue
-
-            month_year = first_message.date.strftime("%B %Y")
-            if month_year not in threads_by_month:
-                threads_by_month[month_year] = []
-            threads_by_month[month_year].append((thread_name, messages))
-
-        # Generate HTML for each month
-        months_html = ""
-        for month_year, month_threads in threads_by_month.items():
-            months_html += f"<h2>{month_year}</h2>\n"
-            for thread_name, messages in month_threads:
-                if not messages:
-                    continue
-
-                first_msg = messages[0]
-                last_msg = messages[-1]
-                started_by_str = self._get_sender_str(first_msg)
-
-                months_html += f"""
-                <div class="thread-preview">
-                    <h3><a href="{first_msg.url}">{self._escape_html(thread_name)}</a></h3>
-                    <div class="thread-meta">
-                        Started by <strong>{started_by_str}</strong> | 
-                        {len(messages)} message{'s' if len(messages) != 1 else ''} | 
-                        First message: {first_msg.date.strftime('%Y-%m-%d') if first_msg.date else 'Unknown date'}
-                        {' | Last message: ' + (last_msg.date.strftime('%Y-%m-%d') if last_msg.date else 'Unknown date') if len(messages) > 1 else ''}
-                    </div>
-                    <div class="message-snippet">
-                        {self._get_snippet(first_msg.html_content, 200) if first_msg.html_content else ''}
-                    </div>
-                </div>
-                """
-
-        total_messages = sum(len(lst) for lst in threads.values())
+        # Group threads by month for better organization. The threads are already
+        # sorted by date, so each month's threads are adjacent.
+        dated_threads = [(name, messages) for name, messages in page_threads if messages and messages[0].date]
+        threads_by_month = [
+            (month_year, list(month_threads))
+            for month_year, month_threads in groupby(dated_threads, key=lambda thread: thread[1][0].month_year)
+        ]
 
         # Generate pagination HTML
         pagination_html = self._generate_pagination_html(page, total_pages)
 
-        # Create the complete HTML
-        html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>{self.forum_name} Archive - Page {page}</title>
-            <link rel="stylesheet" href="static/style.css">
-        </head>
-        <body>
-            <header>
-                <h1>{self.forum_name} - Yahoo Groups Archive</h1>
-                <div class="search-container">
-                    <form action="search/" method="get" class="search-form">
-                        <input type="text" name="q" id="search-input" placeholder="Search messages..." required>
-                        <button type="submit" id="search-button">Search</button>
-                    </form>
-                </div>
-            </header>
-            
-            <main>
-                <p>Total messages: {total_messages} in {total_threads} threads (page {page} of {total_pages})</p>
-                
-                {months_html}
-                
-                <div class="pagination">
-                    {pagination_html}
-                </div>
-            </main>
-            
-            <footer>
-                <p>Generated by Yahoo Groups Mbox to Static Website Converter</p>
-            </footer>
-            
-            <script src="static/script.js"></script>
-        </body>
-        </html>
-        """
-
         # Determine the output filename
         if page == 1:
             output_file = self.output_dir / "index.html"
         else:
             output_file = self.output_dir / f"index{page}.html"
 
-        # Write to file
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(html)
-
-    def _generate_search_index(self, threads: dict[str, List[BaseMessage]]) -> None:
+        # Stream the rendered page straight to the file
+        self.index_template.stream(
+            forum_name=self.forum_name,
+            page=page,
+            total_pages=total_pages,
+            total_messages=total_messages,
+            total_threads=total_threads,
+            threads_by_month=threads_by_month,
+            pagination_html=pagination_html,
+        ).dump(str(output_file), encoding="utf-8")
+
+    def _generate_search_index(self, entries: List[Tuple[int, tuple]]) -> None:
         """
         Generate a search index JSON file and search page.
 
         Args:
-            threads: Dictionary where keys are thread names and values are lists of messages
+            entries: (first message timestamp, row) pairs collected by _prepare_thread_page()
         """
-        search_data = []
+        # Sort newest threads first here, once, so the search page can show matches in index order
+        rows = [row for _, row in sorted(entries, key=itemgetter(0), reverse=True)]
 
-        # Add thread information to search index
-        for thread_idx, (thread_name, messages) in enumerate(threads.items()):
-            if not messages:
-                continue
-
-            first_msg = messages[0]
-
-            # Get unique authors in the thread
-            authors = list({msg.sender_name for msg in messages if msg.sender_name})
-
-            # Add simplified thread information with dates
-            # Make URL relative to the search directory
-            search_data.append(
-                {
-                    "id": thread_idx,
-                    "url": f"../{first_msg.url}",  # Add ../ to go up from search/ to root
-                    "title": thread_name,
-                    "authors": authors,
-                    "message_count": len(messages),
-                    "start_date": messages[0].date.isoformat() if messages[0].date else "",
-                    "last_date": messages[-1].date.isoformat() if messages[-1].date else "",
-                }
-            )
+        # Store the index column by column, so each field name appears once rather than once per thread
+        search_data = {name: [row[i] for row in rows] for i, name in enumerate(SEARCH_INDEX_COLUMNS)}
 
         # Ensure search directory exists
         self.search_dir.mkdir(parents=True, exist_ok=True)
 
-        # Write search index to file
+        # Write search index to file (compact, since it is only read by the browser)
         search_file = self.search_dir / "search_index.json"
-        with open(search_file, "w", encoding="utf-8") as f:
-            json.dump(search_data, f, ensure_ascii=False, indent=2)
+        search_bytes = dump_json_bytes(search_data)
+        search_file.write_bytes(search_bytes)
+
+        # Also write a precompressed copy, which servers such as nginx (gzip_static) can send as-is.
+        # A fixed mtime keeps the output identical between runs.
+        search_file.with_name(search_file.name + ".gz").write_bytes(gzip.compress(search_bytes, 9, mtime=0))
 
         # Write search page
         search_page = self.search_dir / "index.html"
-        with open(search_page, "w", encoding="utf-8") as f:
-            f.write(constants.SEARCH_PAGE_TEMPLATE)
+        self.search_template.stream(forum_name=self.forum_name).dump(str(search_page), encoding="utf-8")
 
-    @staticmethod
-    def _escape_html(text: str) -> str:
-        """Escape HTML special characters."""
-        if not text:
-            return ""
-        return (
-            str(text)
-            .replace("&", "&amp;")
-            .replace("<", "&lt;")
-            .replace(">", "&gt;")
-            .replace('"', "&quot;")
-            .replace("'", "&#39;")
-        )
+        # Copy the service worker that caches the search index next to the search page,
+        # along with a gzipped copy like the other static files
+        sw_file = self.search_dir / "sw.js"
+        shutil.copyfile(SEARCH_SW_ASSET, sw_file)
+        sw_file.with_name(sw_file.name + ".gz").write_bytes(gzip.compress(sw_file.read_bytes(), 9, mtime=0))
 
     @staticmethod
     def _generate_pagination_html(current_page: int, total_pages: int) -> str:
@@ -501,16 +388,46 @@ class SiteGenerator:
         return "\n".join(pagination)
 
     @staticmethod
-    def _get_snippet(html: str, max_length: int = 200) -> str:
-        """Get a text snippet from HTML content."""
-        if not html:
+    def _get_snippet(text: str, max_length: int = 200) -> str:
+        """Get a snippet from a message's plain-text content."""
+        if not text:
             return ""
 
-        # Remove HTML tags and decode HTML entities
-        soup = BeautifulSoup(html, "lxml")
-        text = soup.get_text()
-
         # Truncate and add ellipsis if needed
         if len(text) > max_length:
             return text[:max_length].rsplit(" ", 1)[0] + "..."
         return text
+
+
+@lru_cache(maxsize=None)
+def _template_environment() -> Environment:
+    """Return the Jinja environment for the page templates.
+
+    Created once and shared by the threads rendering thread pages, so the
+    templates are only compiled once.
+    """
+    env = Environment(
+        loader=FileSystemLoader(Path(__file__).parent / "templates"),
+        autoescape=select_autoescape(["html", "xml"]),
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+    env.filters["sender"] = SiteGenerator._get_sender_str
+    env.filters["snippet"] = SiteGenerator._get_snippet
+    return env
+
+
+def _write_thread_page(page: Optional[Tuple[List[BaseMessage], str, str, Path]]) -> None:
+    """Render a thread page and write it to its file. Runs in a worker thread."""
+    if page is None:
+        return
+
+    thread, thread_subject, forum_name, output_file = page
+
+    # Stream the rendered page straight to the file, so a long thread is never held
+    # in memory as one string plus its encoded copy
+    _template_environment().get_template("thread.html").stream(
+        forum_name=forum_name,
+        thread_subject=thread_subject,
+        thread=thread,
+    ).dump(str(output_file), encoding="utf-8")
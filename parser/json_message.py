@@ -5,19 +5,32 @@ This module provides the JSONMessage class which implements the BaseMessage inte
 to handle message data from Yahoo Groups JSON exports.
 """
 import html
+import sys
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 
-from bs4 import BeautifulSoup
 from dateutil import tz
 
 from .base_message import BaseMessage
-from .message_utils import decode_mime_header, normalize_subject, DEFAULT_SUBJECT
+from .message_utils import (
+    decode_mime_header,
+    format_month_year,
+    intern_content,
+    normalize_subject,
+    sanitize_html,
+    DEFAULT_SUBJECT,
+)
 
 
 class JSONMessage(BaseMessage):
     """Implements BaseMessage for JSON-formatted messages from Yahoo Groups."""
 
+    __slots__ = (
+        "_id", "_subject", "_normalized_subj", "_sender_name",
+        "_date", "_timestamp", "_date_str", "_month_year", "_topic_id",
+        "_html_content", "_text_content", "_url",
+    )
+
     def __init__(self, msg_id: int, msg_data: Dict[str, Any]):
         """Initialize a message from JSON data.
         
@@ -25,16 +38,23 @@ class JSONMessage(BaseMessage):
             msg_id: The unique identifier for the message
             msg_data: The message data from the JSON file
         """
+        # Only the fields needed are kept, not msg_data itself: it can hold the raw
+        # email too, which would otherwise stay in memory for every message
         self._id = msg_id
-        self._msg_data = msg_data
         self._subject = html.unescape(decode_mime_header(msg_data.get('subject', DEFAULT_SUBJECT)))
         self._normalized_subj = normalize_subject(self._subject)
         self._sender_name = msg_data.get('authorName') or msg_data.get('profile')
         self._sender_name = html.unescape(self._sender_name)
         # For some reason, the email is not saved in the JSON data
-        self._date = self._parse_date()
+        self._date = self._parse_date(msg_data)
+        self._timestamp = int(self._date.timestamp())
+        # Format the date once here rather than on every page that shows it
+        self._date_str = self._date.strftime("%Y-%m-%d %H:%M:%S %Z")
+        self._month_year = format_month_year(self._date.year, self._date.month)
         self._topic_id = msg_data.get('topicId')
-        self._html_content = self._clean_html_content(msg_data.get('messageBody', ''))
+        html_content, text_content = self._clean_html_content(msg_data.get('messageBody', ''))
+        self._html_content = html_content
+        self._text_content = text_content
         self._url = f"messages/{self._id}.html"
         
     @property
@@ -71,9 +91,25 @@ class JSONMessage(BaseMessage):
     def date(self) -> datetime:
         return self._date
         
+    @property
+    def timestamp(self) -> int:
+        return self._timestamp
+
+    @property
+    def date_str(self) -> str:
+        return self._date_str
+
+    @property
+    def month_year(self) -> str:
+        return self._month_year
+
     @property
     def html_content(self) -> str:
         return self._html_content
+
+    @property
+    def text_content(self) -> str:
+        return self._text_content
         
     @property
     def references(self) -> List[str]:
@@ -94,22 +130,27 @@ class JSONMessage(BaseMessage):
     def url(self, value: str) -> None:
         self._url = value
 
-    def _parse_date(self) -> datetime:
+    def share_strings(self) -> None:
+        """Replace this message's strings with shared copies of equal ones seen before."""
+        # Subjects and senders repeat across many messages, so share one copy of each
+        self._normalized_subj = sys.intern(self._normalized_subj)
+        self._sender_name = sys.intern(self._sender_name)
+        self._html_content = intern_content(self._html_content)
+        self._text_content = intern_content(self._text_content)
+
+    def _parse_date(self, msg_data: Dict[str, Any]) -> datetime:
         """Parse the post date from the message data."""
-        timestamp = int(self._msg_data.get('postDate', 0))
+        timestamp = int(msg_data.get('postDate', 0))
         return datetime.fromtimestamp(timestamp, tz=tz.tzutc())
 
     @staticmethod
-    def _clean_html_content(content: str) -> str:
-        """Clean and sanitize HTML content."""
-        if not content:
-            return ""
+    def _clean_html_content(content: str) -> Tuple[str, str]:
+        """Clean and sanitize HTML content.
 
-        # Use BeautifulSoup to clean the HTML
-        soup = BeautifulSoup(content, 'html.parser')
-
-        # Remove script and style elements
-        for element in soup(["script", "style"]):
-            element.decompose()
+        Returns:
+            Tuple of (cleaned HTML, plain-text content)
+        """
+        if not content:
+            return "", ""
 
-        return str(soup)
+        return sanitize_html(content)
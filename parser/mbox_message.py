@@ -1,32 +1,93 @@
+import sys
 from datetime import datetime
+from email import policy
 from email.message import Message as EmailMessage
+from email.parser import BytesHeaderParser, BytesParser
 from email.utils import parseaddr, parsedate_to_datetime
-from typing import List, Optional
+from html import escape
+from typing import List, Optional, Tuple
 
-from bs4 import BeautifulSoup
 from dateutil import tz
 
 from parser.base_message import BaseMessage
 from parser.message_utils import (
     decode_mime_header,
-    normalize_subject,
+    format_month_year,
+    intern_content,
+    sanitize_html,
     DEFAULT_SUBJECT
 )
 
+# Top-level MIME types that can hold a text or HTML body
+CONTENT_MAINTYPES = {"text", "multipart"}
+
+_HEADER_PARSER = BytesHeaderParser(policy=policy.compat32)
+_MESSAGE_PARSER = BytesParser(policy=policy.compat32)
+
 
 class MboxMessage(BaseMessage):
     """Represents an email message from an mbox file with its metadata and content."""
 
-    def __init__(self, msg_id: int, msg: EmailMessage):
+    __slots__ = (
+        "_id", "_subject", "_normalized_subject", "_sender_name", "_sender_email",
+        "_date", "_timestamp", "_date_str", "_month_year", "_references", "_url",
+        "_msg", "_raw", "_html_content", "_text_content",
+    )
+
+    def __init__(self, msg_id: int, msg: EmailMessage, raw: Optional[bytes] = None):
+        """Initialize a message from a parsed email.
+
+        Args:
+            msg_id: The unique identifier for the message
+            msg: The parsed email. If raw is given, this only needs the headers.
+            raw: The raw message bytes, parsed in full only when the body is needed
+        """
         self._id = msg_id
         self._subject = self._get_header(msg, "Subject", DEFAULT_SUBJECT)
         self._normalized_subject = self._normalize_subject(self.subject)
         self._sender_name, self._sender_email = parseaddr(msg["From"])
         self._date = self._parse_date(msg)
+        self._timestamp = int(self._date.timestamp()) if self._date else 0
+        # Format the date once here rather than on every page that shows it
+        self._date_str = self._date.strftime("%Y-%m-%d %H:%M:%S %Z") if self._date else ""
+        self._month_year = format_month_year(self._date.year, self._date.month) if self._date else ""
         self._references = self._get_references(msg)
-        self._html_content = self._extract_content(msg)
         self._url = f"messages/{self.id}.html"
 
+        # The body is only extracted and sanitized when first needed, so messages
+        # rejected on their headers alone never pay for HTML parsing
+        self._msg = msg
+        self._raw = raw
+        self._html_content = None
+        self._text_content = ""
+
+    @classmethod
+    def from_bytes(cls, msg_id: int, raw: bytes) -> Optional["MboxMessage"]:
+        """Create a message from raw bytes, parsing only the headers up front.
+
+        The MIME structure (including any base64 or quoted-printable parts) is
+        only decoded if the body is actually needed. Returns None without
+        building a message if the headers already show it can't be valid:
+        there is no Date header, or the content type can't hold a text body.
+        """
+        headers = _HEADER_PARSER.parsebytes(raw)
+        if not headers.get("Date") or headers.get_content_maintype() not in CONTENT_MAINTYPES:
+            return None
+        return cls(msg_id, headers, raw)
+
+    def _load_content(self) -> None:
+        """Extract the message body, if that hasn't happened yet."""
+        if self._msg is None:
+            return
+
+        msg = self._msg if self._raw is None else _MESSAGE_PARSER.parsebytes(self._raw)
+        html_content, text_content = self._extract_content(msg)
+        self._html_content = html_content
+        self._text_content = text_content
+        # The email is no longer needed once the body has been extracted
+        self._msg = None
+        self._raw = None
+
     @staticmethod
     def _get_header(msg: EmailMessage, header: str, default: str = "") -> str:
         """Safely get a header from the email message."""
@@ -55,14 +116,19 @@ class MboxMessage(BaseMessage):
         """Extract message references for threading."""
         refs = []
         if "References" in msg:
-            refs.extend(msg["References"].replace("\n", "").split())
+            # split() with no arguments already treats header folding newlines as separators
+            refs.extend(msg["References"].split())
         if "In-Reply-To" in msg:
             refs.append(msg["In-Reply-To"])
         return [ref.strip("<>") for ref in refs if ref.strip()]
 
     @staticmethod
-    def _extract_content(msg: EmailMessage) -> Optional[str]:
-        """Extract and process the message content."""
+    def _extract_content(msg: EmailMessage) -> Tuple[Optional[str], str]:
+        """Extract and process the message content.
+
+        Returns:
+            Tuple of (HTML content, plain-text content)
+        """
         # Try to get HTML content first
         html_part = None
         text_part = None
@@ -85,18 +151,15 @@ class MboxMessage(BaseMessage):
 
         # Return HTML if available, otherwise convert text to HTML
         if html_part:
-            # Clean up HTML
-            soup = BeautifulSoup(html_part, "lxml")
-            # Remove potentially harmful elements
-            for element in soup(["script", "iframe", "object", "embed"]):
-                element.decompose()
-            return str(soup)
-        elif text_part:
-            # Convert plain text to HTML, preserving line breaks
-            text_part = text_part.replace("\n", "<br>\n")
-            return f'<div class="plaintext-content">{text_part}</div>'
-
-        return None
+            html, text = sanitize_html(html_part)
+            if html:
+                return html, text
+        if text_part:
+            # Convert plain text to HTML, escaping it and preserving line breaks
+            html_text = escape(text_part).replace("\n", "<br>\n")
+            return f'<div class="plaintext-content">{html_text}</div>', text_part
+
+        return None, ""
 
     # Property implementations from BaseMessage
     @property
@@ -123,10 +186,28 @@ class MboxMessage(BaseMessage):
     def date(self) -> datetime:
         return self._date
 
+    @property
+    def timestamp(self) -> int:
+        return self._timestamp
+
+    @property
+    def date_str(self) -> str:
+        return self._date_str
+
+    @property
+    def month_year(self) -> str:
+        return self._month_year
+
     @property
     def html_content(self) -> str:
+        self._load_content()
         return self._html_content
 
+    @property
+    def text_content(self) -> str:
+        self._load_content()
+        return self._text_content
+
     @property
     def references(self) -> List[str]:
         return self._references
@@ -140,3 +221,12 @@ class MboxMessage(BaseMessage):
     def url(self, value: str) -> None:
         """Set the URL of the message."""
         self._url = value
+
+    def share_strings(self) -> None:
+        """Replace this message's strings with shared copies of equal ones seen before."""
+        # Subjects and senders repeat across many messages, so share one copy of each
+        self._normalized_subject = sys.intern(self._normalized_subject)
+        self._sender_name = sys.intern(self._sender_name)
+        self._sender_email = sys.intern(self._sender_email)
+        self._html_content = intern_content(self._html_content)
+        self._text_content = intern_content(self._text_content)
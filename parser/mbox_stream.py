@@ -0,0 +1,58 @@
+"""
+Streaming reader for mbox files.
+
+Splits an mbox file into raw messages with a single sequential scan of a
+memory-mapped view of the file, instead of building a mailbox.mbox index.
+"""
+
+import mmap
+import os
+from typing import Iterator
+
+# Every message in an mbox file starts with a "From " separator line
+FROM_LINE = b"From "
+SEPARATOR = b"\n" + FROM_LINE
+
+
+def _message_bytes(mm: mmap.mmap, start: int, end: int) -> bytes:
+    """Return the message spanning [start, end) without its "From " separator line.
+
+    Like mailbox.mbox, a blank line at the end, which separates the message from
+    the next "From " line, is not part of the message either.
+    """
+    body_start = mm.find(b"\n", start, end)
+    if body_start == -1:
+        return b""
+    if mm[end - 2 : end] == b"\n\n":
+        end -= 1
+    return mm[body_start + 1 : end]
+
+
+def iter_messages(mbox_path: str) -> Iterator[bytes]:
+    """Yield the raw bytes of each message in an mbox file, in file order.
+
+    Like mailbox.mbox.get_bytes(), the "From " separator line is not included.
+    Anything before the first separator line is ignored.
+    """
+    with open(mbox_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # mmap.find() is a plain substring search, which is much
+            # cheaper than running a multiline regex over the whole file
+            if mm[: len(FROM_LINE)] == FROM_LINE:
+                start = 0
+            else:
+                start = mm.find(SEPARATOR)
+                if start == -1:
+                    return
+                start += 1
+
+            while True:
+                end = mm.find(SEPARATOR, start)
+                if end == -1:
+                    yield _message_bytes(mm, start, len(mm))
+                    return
+                yield _message_bytes(mm, start, end + 1)
+                start = end + 1
@@ -2,11 +2,46 @@
 Shared utilities for message processing.
 """
 import re
+from collections import OrderedDict
+from datetime import date
 from email.header import decode_header
+from functools import lru_cache
+from typing import Iterable, Optional, Pattern, Tuple
+
+import nh3
+from lxml import html as lxml_html
 
 DEFAULT_SUBJECT = "(No subject)"
+# Subjects repeat across every message in a thread, so decoding and normalizing
+# them is cached. The bound keeps memory in check on very large archives.
+SUBJECT_CACHE_SIZE = 1 << 16
 BRACKET_REGEX = re.compile(r"^\s*\[.*?]\s*")
-PREFIXES_TO_STRIP = ["re:", "fwd:", "fw:", "aw:", "vs:", "sv:", "re[\d]*:", "fwd[\d]*:"]
+# Parenthetical references to the original subject, e.g. "... (was Re: Original Subject)"
+WAS_REGEX = re.compile(r"\(\s*was\s+([^)]*)\)", re.IGNORECASE)
+# Attachment indicators at the end of a subject, e.g. "[2 Attachments]"
+ATTACHMENT_REGEX = re.compile(r"\s*\[\s*\d+\s+Attachments?\s*]\s*$", re.IGNORECASE)
+# Reply/forward prefixes, as regex patterns, e.g. "Re:", "Re2:", "Fwd:", "AW:"
+PREFIXES_TO_STRIP = [r"re\d*:", r"fwd\d*:", "fw:", "aw:", "vs:", "sv:"]
+# Bodies shorter than this are not worth keeping in the intern table
+MIN_INTERN_LENGTH = 1024
+# Most bodies kept in the intern table; the least recently seen are dropped first
+INTERN_TABLE_SIZE = 1 << 12
+_INTERNED_CONTENT: "OrderedDict[str, str]" = OrderedDict()
+# Tags that are removed together with everything inside them when sanitizing
+CLEAN_CONTENT_TAGS = {"script", "style", "title", "iframe", "object"}
+# Attributes kept when sanitizing: nh3's defaults (e.g. href on links, src and alt
+# on images) plus id anywhere, titles on links and class on <div> and <span> only
+SANITIZE_ATTRIBUTES = {
+    **nh3.ALLOWED_ATTRIBUTES,
+    "*": {"id"},
+    "a": nh3.ALLOWED_ATTRIBUTES["a"] | {"title"},
+    "div": {"class"},
+    "span": {"class"},
+}
+# Bodies repeat too, but are much larger than subjects, so fewer sanitized ones are kept
+SANITIZE_CACHE_SIZE = 1 << 10
+# Control characters that lxml refuses to parse (everything below 0x20 except tab, LF and CR)
+CONTROL_CHARS_REGEX = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
 
 
 def decode_mime_header(header: str) -> str:
@@ -38,38 +73,89 @@ def decode_mime_header(header: str) -> str:
         return str(header).lstrip("_").strip()
 
 
+def compile_prefix_regex(prefix_patterns: Iterable[str]) -> Pattern[str]:
+    """Compile a regex matching any run of reply/forward prefixes and [bracketed] prefixes
+    at the start of a subject, e.g. "Re: [group] Fwd: ", so they can all be stripped in one pass.
+    """
+    return re.compile(
+        r"^(?:" + BRACKET_REGEX.pattern.lstrip("^") + r"|(?:" + "|".join(prefix_patterns) + r")\s*)+",
+        re.IGNORECASE,
+    )
+
+
+SUBJECT_PREFIX_REGEX = compile_prefix_regex(PREFIXES_TO_STRIP)
+
+
+def intern_content(content: Optional[str]) -> Optional[str]:
+    """Return a shared copy of a message body, so identical bodies are stored only once.
+
+    Archives often contain the same long body several times (cross-posts,
+    resent digests), so equal bodies are collapsed onto a single string object.
+    Only useful in the main process: messages parsed in worker processes come
+    back with their own copy of every string, so they are interned once received.
+    """
+    if not content or len(content) < MIN_INTERN_LENGTH:
+        return content
+    shared = _INTERNED_CONTENT.get(content)
+    if shared is None:
+        _INTERNED_CONTENT[content] = content
+        if len(_INTERNED_CONTENT) > INTERN_TABLE_SIZE:
+            _INTERNED_CONTENT.popitem(last=False)
+        return content
+    _INTERNED_CONTENT.move_to_end(content)
+    return shared
+
+
+@lru_cache(maxsize=SANITIZE_CACHE_SIZE)
+def sanitize_html(html: str) -> Tuple[str, str]:
+    """Sanitize an HTML message body and return it along with its plain-text content.
+
+    Sanitizing is done by nh3's allow-list in a single native pass, which drops
+    scripts, frames, embedded objects, <font> tags and every attribute not in
+    SANITIZE_ATTRIBUTES, such as style and event handlers. lxml is only used to
+    pull the text used for snippets out of the already sanitized markup. Returns ("", "") if nothing is left.
+
+    Cached, since the same body often appears in several messages (cross-posts,
+    resent digests); repeats then also share the returned strings.
+    """
+    html = nh3.clean(
+        CONTROL_CHARS_REGEX.sub("", html),
+        attributes=SANITIZE_ATTRIBUTES,
+        clean_content_tags=CLEAN_CONTENT_TAGS,
+    )
+    if not html.strip():
+        return "", ""
+
+    tree = lxml_html.fragment_fromstring(html, create_parent="div")
+    return html, tree.text_content()
+
+
+@lru_cache(maxsize=None)
+def format_month_year(year: int, month: int) -> str:
+    """Return the month and year for display, e.g. "March 2004".
+
+    Every message from the same month shares the result, so it is cached; an
+    archive only spans a few hundred months.
+    """
+    return date(year, month, 1).strftime("%B %Y")
+
+
+@lru_cache(maxsize=SUBJECT_CACHE_SIZE)
 def normalize_subject(subject: str) -> str:
     """Normalize thread subject by removing common prefixes and formatting."""
     if not subject:
         return DEFAULT_SUBJECT
 
     # Extract content from parenthetical references like "... (was Original Subject)"
-    match = re.search(r"\(\s * was\s+([^)] * )\)", subject, flags = re.IGNORECASE)
+    match = WAS_REGEX.search(subject)
     if match:
         subject = match.group(1).strip()
 
     # Remove any attachment indicators from the end (e.g., [1 Attachment], [2 Attachments], etc.)
-    subject = re.sub(r"\s*\[\s*\d+\s+Attachments?\s*]\s*$", "", subject, flags=re.IGNORECASE)
-
-    # Process prefixes and other normalizations
-    stripped = True
-    while stripped:
-        stripped = False
-
-        # Remove [bracketed] prefixes
-        subject = re.sub(BRACKET_REGEX, "", subject)
-
-        # Check for and remove reply/forward prefixes (Re:, Fwd:, etc.)
-        lower_subject = subject.lower()
-        for p in PREFIXES_TO_STRIP:
-            if lower_subject.startswith(p.lower()):
-                subject = subject[len(p):].lstrip()  # remove the prefix + leading spaces
-                stripped = True
-                break  # check prefixes again from the start
-
-        # If we still have [bracketed] content, strip it in the next iteration
-        if re.match(BRACKET_REGEX, subject):
-            stripped = True
+    subject = ATTACHMENT_REGEX.sub("", subject)
+
+    # Remove any run of reply/forward prefixes (Re:, Fwd:, etc.) and [bracketed] prefixes
+    subject = SUBJECT_PREFIX_REGEX.sub("", subject, count=1)
 
     subject = subject.strip()
     return subject if subject else DEFAULT_SUBJECT
@@ -0,0 +1,269 @@
+// Creating a formatter is expensive, so one is shared by every formatDate call
+const dateFormat = new Intl.DateTimeFormat('en-US', {
+    year: 'numeric',
+    month: 'short',
+    day: 'numeric',
+    hour: '2-digit',
+    minute: '2-digit'
+});
+
+// Cache the search index across visits to the search page
+if ('serviceWorker' in navigator) {
+    navigator.serviceWorker.register('sw.js').catch(error => {
+        console.error('Error registering search index cache:', error);
+    });
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    const searchInput = document.getElementById('search-query');
+    const searchForm = document.getElementById('search-form');
+    const resultsContainer = document.getElementById('search-results');
+    const loadingEl = document.getElementById('loading');
+    const paginationEl = document.getElementById('pagination');
+
+    // One worker serves every search on the page, so the index is loaded once
+    // and its cache of recent queries outlives each search
+    const searchWorker = new Worker('../static/search-worker.js');
+    // Searches waiting on the worker, by request id
+    const pendingSearches = new Map();
+    let lastSearchId = 0;
+
+    // Pause after the last keystroke before searching as the user types
+    const SEARCH_DELAY_MS = 150;
+    let searchTimer = null;
+    // Whether the current history entry was added while typing; later searches
+    // replace it, so going back skips the partial queries
+    let typedEntry = false;
+
+    searchWorker.addEventListener('message', function(e) {
+        const pending = pendingSearches.get(e.data.id);
+        if (!pending) {
+            return;
+        }
+        pendingSearches.delete(e.data.id);
+        if (e.data.error) {
+            pending.reject(new Error(e.data.error));
+        } else {
+            pending.resolve(e.data);
+        }
+    });
+    searchWorker.addEventListener('error', function(e) {
+        for (const pending of pendingSearches.values()) {
+            pending.reject(e);
+        }
+        pendingSearches.clear();
+    });
+
+    // The index is fetched here rather than in the worker, so the request is made
+    // from within search/ and the service worker there can cache it
+    fetch('search_index.json')
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`Loading the search index failed: ${response.status}`);
+            }
+            return response.arrayBuffer();
+        })
+        .then(index => searchWorker.postMessage({ index: index }, [index]))
+        .catch(error => searchWorker.postMessage({ indexError: String(error) }));
+
+    // Load search results for the query in the URL, also when going back and forward
+    showSearchFromUrl();
+    window.addEventListener('popstate', showSearchFromUrl);
+
+    // Search as the user types, once they pause, rather than on every keystroke
+    searchInput.addEventListener('input', function() {
+        clearTimeout(searchTimer);
+        const newQuery = searchInput.value.trim();
+        if (!newQuery) {
+            return;
+        }
+        searchTimer = setTimeout(function() {
+            setSearchUrl(`?q=${encodeURIComponent(newQuery)}`, typedEntry);
+            typedEntry = true;
+            performSearch(newQuery);
+        }, SEARCH_DELAY_MS);
+    });
+
+    // Handle search form submission
+    if (searchForm) {
+        searchForm.addEventListener('submit', function(e) {
+            e.preventDefault();
+            clearTimeout(searchTimer);
+            const newQuery = searchInput.value.trim();
+            if (newQuery) {
+                setSearchUrl(`?q=${encodeURIComponent(newQuery)}`, typedEntry);
+                typedEntry = false;
+                performSearch(newQuery);
+            }
+        });
+    }
+
+    // Change pages in place; clicks meant to open a new tab or window are left alone
+    paginationEl.addEventListener('click', function(e) {
+        const link = e.target.closest('a');
+        if (!link || e.button !== 0 || e.metaKey || e.ctrlKey || e.shiftKey || e.altKey) {
+            return;
+        }
+        e.preventDefault();
+        history.pushState(null, '', link.href);
+        showSearchFromUrl();
+        window.scrollTo(0, 0);
+    });
+
+    function setSearchUrl(url, replace) {
+        if (replace) {
+            history.replaceState(null, '', url);
+        } else {
+            history.pushState(null, '', url);
+        }
+    }
+
+    function showSearchFromUrl() {
+        clearTimeout(searchTimer);
+        typedEntry = false;
+        const urlParams = new URLSearchParams(window.location.search);
+        const query = urlParams.get('q') || '';
+        const page = parseInt(urlParams.get('page') || '1');
+
+        // Set search query in input
+        if (searchInput) {
+            searchInput.value = query;
+        }
+
+        if (query) {
+            performSearch(query, page);
+        } else {
+            // Drop the results of any search still running
+            lastSearchId++;
+            loadingEl.style.display = 'none';
+            resultsContainer.innerHTML = '';
+            paginationEl.innerHTML = '';
+        }
+    }
+
+    async function performSearch(query, page = 1) {
+        const resultsPerPage = 10;
+        // Results of searches started before a newer one are dropped
+        const searchId = ++lastSearchId;
+
+        try {
+            loadingEl.style.display = 'block';
+            resultsContainer.innerHTML = '';
+            paginationEl.innerHTML = '';
+
+            // Results come back sorted by thread start date (newest first);
+            // the worker only sends the current page, along with the total count
+            const startIdx = (page - 1) * resultsPerPage;
+            const { total: totalResults, results: pageResults } =
+                await searchInWorker(searchId, query.toLowerCase(), startIdx, resultsPerPage);
+            if (searchId !== lastSearchId) {
+                return;
+            }
+
+            // Pagination
+            const totalPages = Math.ceil(totalResults / resultsPerPage);
+
+            // Display results
+            if (totalResults === 0) {
+                resultsContainer.innerHTML = `<p>No results found for "${escapeHtml(query)}"</p>`;
+            } else {
+                const resultsHtml = `
+                    <p>Found ${totalResults} result${totalResults === 1 ? '' : 's'} for "${escapeHtml(query)}"</p>
+                    <div class="search-results">
+                        ${pageResults.map(result => `
+                            <div class="search-result">
+                                <h3><a href="${result.url_html}">${result.title_html}</a></h3>
+                                <div class="search-meta">
+                                    ${result.authors_html
+                                        ? `<span>By: ${result.authors_html}</span>` 
+                                        : '<span>No author information</span>'}
+                                    <span class="message-count">${result.message_count} message${result.message_count !== 1 ? 's' : ''}</span>
+                                    ${result.start_date_ts || result.last_date_ts ? `
+                                        <div class="thread-dates">
+                                            ${result.start_date_ts ? `<span>Started: ${formatDate(result.start_date_ts)}</span>` : ''}
+                                            ${result.last_date_ts && result.last_date_ts !== result.start_date_ts ? 
+                                                `<span>Last post: ${formatDate(result.last_date_ts)}</span>` : ''}
+                                        </div>
+                                    ` : ''}
+                                </div>
+                            </div>
+                        `).join('')}
+                    </div>
+                `;
+                resultsContainer.innerHTML = resultsHtml;
+
+                // Add pagination
+                if (totalPages > 1) {
+                    const queryParam = encodeURIComponent(query);
+                    const pageLink = i => i === page
+                        ? `<span class="current">${i}</span>`
+                        : `<a href="?q=${queryParam}&page=${i}">${i}</a>`;
+                    const paginationParts = ['<div class="pagination">'];
+
+                    // Previous button
+                    if (page > 1) {
+                        paginationParts.push(`<a href="?q=${queryParam}&page=${page - 1}">&laquo; Previous</a>`);
+                    }
+
+                    // Page numbers: the first page, up to two pages either side of the current
+                    // one and the last page, with an ellipsis wherever pages are skipped
+                    const windowStart = Math.max(2, page - 2);
+                    const windowEnd = Math.min(totalPages - 1, page + 2);
+                    paginationParts.push(pageLink(1));
+                    if (windowStart > 2) {
+                        paginationParts.push('<span class="ellipsis">...</span>');
+                    }
+                    for (let i = windowStart; i <= windowEnd; i++) {
+                        paginationParts.push(pageLink(i));
+                    }
+                    if (windowEnd < totalPages - 1) {
+                        paginationParts.push('<span class="ellipsis">...</span>');
+                    }
+                    paginationParts.push(pageLink(totalPages));
+
+                    // Next button
+                    if (page < totalPages) {
+                        paginationParts.push(`<a href="?q=${queryParam}&page=${page + 1}">Next &raquo;</a>`);
+                    }
+
+                    paginationParts.push('</div>');
+                    paginationEl.innerHTML = paginationParts.join('');
+                }
+            }
+        } catch (error) {
+            if (searchId !== lastSearchId) {
+                return;
+            }
+            console.error('Error performing search:', error);
+            resultsContainer.innerHTML = '<p>An error occurred while performing the search. Please try again.</p>';
+        } finally {
+            if (searchId === lastSearchId) {
+                loadingEl.style.display = 'none';
+            }
+        }
+    }
+
+    // Filter the search index in the worker, keeping the page responsive
+    function searchInWorker(id, query, start, count) {
+        return new Promise((resolve, reject) => {
+            pendingSearches.set(id, { resolve: resolve, reject: reject });
+            searchWorker.postMessage({ id: id, query: query, start: start, count: count });
+        });
+    }
+
+    function formatDate(timestamp) {
+        if (!timestamp) return '';
+        return dateFormat.format(new Date(timestamp * 1000));
+    }
+
+    function escapeHtml(unsafe) {
+        if (!unsafe) return '';
+        return unsafe
+            .toString()
+            .replace(/&/g, '&amp;')
+            .replace(/</g, '&lt;')
+            .replace(/>/g, '&gt;')
+            .replace(/"/g, '&quot;')
+            .replace(/'/g, '&#039;');
+    }
+});
@@ -0,0 +1,32 @@
+// Serves the search index from the browser cache while refreshing it in the
+// background (stale-while-revalidate), so repeat searches don't wait on the network.
+// Installed in search/ so that its scope covers the search page, which
+// fetches the index itself for this reason; the search worker is outside it.
+const CACHE_NAME = 'search-index';
+
+self.addEventListener('install', () => self.skipWaiting());
+self.addEventListener('activate', event => event.waitUntil(self.clients.claim()));
+
+self.addEventListener('fetch', function(event) {
+    if (!event.request.url.endsWith('/search_index.json')) {
+        return;
+    }
+
+    event.respondWith(caches.open(CACHE_NAME).then(cache =>
+        cache.match(event.request).then(cached => {
+            const network = fetch(event.request).then(response => {
+                if (response.ok) {
+                    cache.put(event.request, response.clone());
+                }
+                return response;
+            });
+
+            if (cached) {
+                // Refresh the cached copy for next time without delaying this response
+                event.waitUntil(network.catch(() => {}));
+                return cached;
+            }
+            return network;
+        })
+    ));
+});
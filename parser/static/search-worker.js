@@ -0,0 +1,93 @@
+// Parses the search index and runs queries off the page's main thread, so
+// a large index never blocks the UI. The page downloads the index and hands
+// over the raw bytes: only its own requests go through the service worker
+// in search/ that caches the index, as this script lives outside its scope.
+let resolveIndex, rejectIndex;
+const searchIndex = new Promise((resolve, reject) => {
+    resolveIndex = resolve;
+    rejectIndex = reject;
+});
+
+// Matching thread indices of recent queries, oldest first, so repeated and
+// narrowing searches skip the full scan
+const queryCache = new Map();
+const MAX_CACHED_QUERIES = 32;
+
+self.addEventListener('message', async function(e) {
+    if (e.data.index) {
+        try {
+            resolveIndex(JSON.parse(new TextDecoder().decode(e.data.index)));
+        } catch (error) {
+            rejectIndex(error);
+        }
+        return;
+    }
+    if (e.data.indexError) {
+        rejectIndex(new Error(e.data.indexError));
+        return;
+    }
+
+    // Answers carry the request's id, so the page can match them to its searches
+    const { id, query, start, count } = e.data;
+    try {
+        const searchData = await searchIndex;
+        const rows = search(searchData, query);
+        // Only the requested page of results is built and sent back
+        const results = rows.slice(start, start + count).map(i => threadAt(searchData, i));
+        postMessage({ id: id, total: rows.length, results: results });
+    } catch (error) {
+        postMessage({ id: id, error: String(error) });
+    }
+});
+
+// Return the indices of the threads matching a query, from the cache when possible
+function search(searchData, query) {
+    let rows = queryCache.get(query);
+    if (rows) {
+        // Move the query to the end so it is evicted last
+        queryCache.delete(query);
+    } else {
+        rows = matchingRows(searchData, query);
+    }
+    queryCache.set(query, rows);
+    if (queryCache.size > MAX_CACHED_QUERIES) {
+        queryCache.delete(queryCache.keys().next().value);
+    }
+    return rows;
+}
+
+// Return the indices of the threads matching a query, in index order
+function matchingRows(searchData, query) {
+    // Titles and authors are already lowercased in the index;
+    // it is sorted newest first, so the results are too
+    const searchText = searchData.search_text;
+
+    // A thread matching the query also matches any part of it, so when a cached
+    // query is contained in this one (as while typing), only its matches need checking
+    let candidates = null;
+    for (const [cachedQuery, cachedRows] of queryCache) {
+        if (query.includes(cachedQuery) && (!candidates || cachedRows.length < candidates.length)) {
+            candidates = cachedRows;
+        }
+    }
+    if (candidates) {
+        return candidates.filter(i => searchText[i].includes(query));
+    }
+
+    const rows = [];
+    searchText.forEach((text, i) => {
+        if (text.includes(query)) {
+            rows.push(i);
+        }
+    });
+    return rows;
+}
+
+// The index is stored column by column; build a thread object from row i of every column
+function threadAt(searchData, i) {
+    const thread = {};
+    for (const column in searchData) {
+        thread[column] = searchData[column][i];
+    }
+    return thread;
+}
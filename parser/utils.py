@@ -1,10 +1,32 @@
 """Utility functions for the Yahoo Groups Mbox to Static Website Converter."""
 
+import json
+import os
 import re
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Tuple, TypeVar
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library parser is used without it
+    orjson = None
 
 from parser.base_message import BaseMessage
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Number of items handed to a worker process at a time
+PARSE_CHUNK_SIZE = 64
+
+# Maximum number of batches queued in the worker pool at once
+MAX_PENDING_BATCHES = 4 * (os.cpu_count() or 1)
+
+# Messages dated before this year are treated as corrupted
+MIN_VALID_YEAR = 1998
+
 
 def slugify(text: str) -> str:
     """Convert text to a filesystem-safe string.
@@ -32,11 +54,86 @@ def slugify(text: str) -> str:
     return text.strip("-")
 
 def _is_valid_message(message: BaseMessage) -> bool:
+    date = message.date
     # The first messages should be from 1998. Anything earlier is probably corrupted.
-    if message.date:
-        # Make the comparison timezone-aware by localizing the cutoff date to the message timezone
-        cutoff_date = datetime(1998, 1, 1, tzinfo=message.date.tzinfo)
-        if message.date < cutoff_date:
-            return False
+    # Comparing the year is the same as comparing with midnight on January 1st in the
+    # message's own timezone, without building a cutoff datetime for every message.
+    if not date or date.year < MIN_VALID_YEAR:
+        return False
+
+    # Check the date first: for some message types the content is extracted lazily
+    return bool(message.html_content)
+
+
+def find_numbered_json_files(json_dir: str) -> List[Tuple[str, str]]:
+    """Find the files named <integer>.json (e.g. 12345.json) in a directory.
+
+    The directory is scanned once with os.scandir, and each number is parsed only
+    once for sorting.
+
+    Args:
+        json_dir: Path to the directory to scan
+
+    Returns:
+        List of (filename, path) tuples, sorted by the number in the filename
+    """
+    entries = []
+    with os.scandir(json_dir) as it:
+        for entry in it:
+            name = entry.name
+            if name.endswith(".json") and name[:-5].isdigit() and entry.is_file():
+                entries.append((int(name[:-5]), name, entry.path))
+
+    entries.sort(key=lambda e: e[0])
+    return [(name, path) for _, name, path in entries]
+
+
+def load_json_file(path: str) -> Any:
+    """Load a JSON file, using orjson if it is installed.
+
+    orjson parses the raw bytes directly and is several times faster than the json
+    module. Its JSONDecodeError subclasses json.JSONDecodeError, so callers only
+    need to handle the latter.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_json_bytes(data: Any) -> bytes:
+    """Encode data as compact UTF-8 JSON, using orjson if it is installed.
+
+    Both encoders produce the same output: no whitespace between tokens and
+    non-ASCII characters written as-is rather than as \\u escapes.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _apply_to_batch(func: Callable[[T], R], batch: List[T]) -> List[R]:
+    """Apply func to a batch of items in a worker process."""
+    return [func(item) for item in batch]
+
+
+def parallel_map(func: Callable[[T], R], items: Iterable[T]) -> Iterator[R]:
+    """Apply func to every item in a process pool, yielding the results in input order.
+
+    Items are sent to the workers PARSE_CHUNK_SIZE at a time, and only
+    MAX_PENDING_BATCHES batches are queued at once, so items are consumed no faster
+    than they are processed and memory use stays flat for large archives.
+    func must be a module-level function so that it can be pickled.
+    """
+    items = iter(items)
+    pending = deque()
+
+    with ProcessPoolExecutor() as executor:
+        while batch := list(islice(items, PARSE_CHUNK_SIZE)):
+            pending.append(executor.submit(_apply_to_batch, func, batch))
+            if len(pending) >= MAX_PENDING_BATCHES:
+                yield from pending.popleft().result()
 
-    return bool(message.html_content and message.date)
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,71 @@
+import gzip
+import json
+
+import pytest
+
+from parser.generator import SEARCH_INDEX_COLUMNS, SEARCH_SW_ASSET, SiteGenerator
+from parser.json_message import JSONMessage
+
+
+def _message(msg_id: int, topic_id: int, subject: str, author: str, post_date: int) -> JSONMessage:
+    return JSONMessage(
+        msg_id,
+        {
+            "subject": subject,
+            "authorName": author,
+            "postDate": post_date,
+            "topicId": topic_id,
+            "messageBody": f"<p>Body {msg_id}</p>",
+        },
+    )
+
+
+class TestSearchIndex:
+    @pytest.fixture
+    def search_index(self, tmp_path):
+        threads = {
+            "Older <thread>": [
+                _message(1, 1, "Older <thread>", "Alice & Co", 1000000000),
+                _message(2, 1, "Re: Older <thread>", "Bob", 1000000100),
+                _message(3, 1, "Re: Older <thread>", "Alice & Co", 1000000200),
+            ],
+            "Newer Thread": [
+                _message(4, 4, "Newer Thread", "Carol", 1100000000),
+            ],
+        }
+        SiteGenerator(str(tmp_path), "Test Forum").generate_site(threads)
+        search_dir = tmp_path / "search"
+        return search_dir, json.loads((search_dir / "search_index.json").read_text(encoding="utf-8"))
+
+    def test_columns(self, search_index):
+        _, index = search_index
+        assert tuple(index) == SEARCH_INDEX_COLUMNS
+        assert all(len(values) == 2 for values in index.values())
+
+    def test_rows_newest_first(self, search_index):
+        _, index = search_index
+        assert index["title_html"] == ["Newer Thread", "Older &lt;thread&gt;"]
+        assert index["start_date_ts"] == [1100000000, 1000000000]
+        assert index["last_date_ts"] == [1100000000, 1000000200]
+        assert index["message_count"] == [1, 3]
+
+    def test_authors_unique_in_first_message_order(self, search_index):
+        _, index = search_index
+        assert index["authors_html"] == ["Carol", "Alice &amp; Co, Bob"]
+
+    def test_search_text_lowercased(self, search_index):
+        _, index = search_index
+        assert index["search_text"] == ["newer thread\ncarol", "older <thread>\nalice & co\nbob"]
+
+    def test_urls_relative_to_search_page(self, search_index):
+        search_dir, index = search_index
+        for url in index["url_html"]:
+            assert url.startswith("../messages/")
+            assert (search_dir / url).is_file()
+
+    def test_service_worker_next_to_search_page(self, search_index):
+        search_dir, _ = search_index
+        sw_bytes = SEARCH_SW_ASSET.read_bytes()
+        assert (search_dir / "sw.js").read_bytes() == sw_bytes
+        assert gzip.decompress((search_dir / "sw.js.gz").read_bytes()) == sw_bytes
+        assert not (search_dir.parent / "static" / SEARCH_SW_ASSET.name).exists()
@@ -0,0 +1,20 @@
+from parser.mbox_message import MboxMessage
+
+HEADERS = b"From: Alice <alice@example.com>\nSubject: Hello\nDate: Mon, 1 Jan 2001 00:00:00 +0000\n"
+
+
+class TestExtractContent:
+    def test_plain_text_is_escaped(self):
+        raw = HEADERS + b"Content-Type: text/plain\n\n<script>alert(1)</script>\nA & B\n"
+        msg = MboxMessage.from_bytes(1, raw)
+
+        assert msg.html_content == (
+            '<div class="plaintext-content">&lt;script&gt;alert(1)&lt;/script&gt;<br>\nA &amp; B<br>\n</div>'
+        )
+        assert msg.text_content == "<script>alert(1)</script>\nA & B\n"
+
+    def test_html_is_sanitized(self):
+        raw = HEADERS + b'Content-Type: text/html\n\n<p id="a" onclick="x()">Hi<script>alert(1)</script></p>\n'
+        msg = MboxMessage.from_bytes(1, raw)
+
+        assert msg.html_content.strip() == '<p id="a">Hi</p>'
@@ -0,0 +1,53 @@
+import mailbox
+
+import pytest
+
+from parser.mbox_stream import iter_messages
+
+MESSAGE_1 = b"From: a@example.com\nSubject: One\n\nFirst body\n>From the start of a line\n"
+MESSAGE_2 = b"From: b@example.com\nSubject: Two\n\nSecond body, From mid-line\n\n\nTrailing blank lines\n"
+
+
+class TestIterMessages:
+    @pytest.mark.parametrize(
+        "content",
+        [
+            # Messages separated by a blank line, as mailbox.mbox writes them
+            b"From a Mon Jan  1 00:00:00 2001\n"
+            + MESSAGE_1
+            + b"\nFrom b Mon Jan  1 00:00:00 2001\n"
+            + MESSAGE_2
+            + b"\n",
+            # No blank line before the next "From " line, and none at the end
+            b"From a Mon Jan  1 00:00:00 2001\n" + MESSAGE_1 + b"From b Mon Jan  1 00:00:00 2001\n" + MESSAGE_2,
+            # Text before the first "From " line is ignored
+            b"preamble\n\nFrom a Mon Jan  1 00:00:00 2001\n" + MESSAGE_1 + b"\n",
+            # A file that doesn't end with a newline
+            b"From a Mon Jan  1 00:00:00 2001\n" + MESSAGE_1 + b"\nFrom b Mon Jan  1 00:00:00 2001\nSubject: Three",
+            # A message with no headers or body
+            b"From a Mon Jan  1 00:00:00 2001\n\nFrom b Mon Jan  1 00:00:00 2001\n" + MESSAGE_2,
+            # No messages at all
+            b"",
+            b"no separator line\n",
+        ],
+    )
+    def test_matches_mailbox(self, tmp_path, content: bytes):
+        mbox_path = tmp_path / "test.mbox"
+        mbox_path.write_bytes(content)
+
+        mbox = mailbox.mbox(str(mbox_path))
+        expected = [mbox.get_bytes(key) for key in mbox.keys()]
+        mbox.close()
+
+        assert list(iter_messages(str(mbox_path))) == expected
+
+    def test_matches_mailbox_written_file(self, tmp_path):
+        mbox_path = tmp_path / "written.mbox"
+        mbox = mailbox.mbox(str(mbox_path))
+        for i in range(5):
+            mbox.add(f"From: user{i}@example.com\nSubject: Message {i}\n\nBody {i}\nFrom here on\n\n".encode())
+        mbox.flush()
+        expected = [mbox.get_bytes(key) for key in mbox.keys()]
+        mbox.close()
+
+        assert list(iter_messages(str(mbox_path))) == expected
@@ -0,0 +1,148 @@
+import pytest
+
+from parser.base_message import PREFIX_REGEX, BaseMessage
+from parser import message_utils
+from parser.message_utils import (
+    DEFAULT_SUBJECT,
+    MIN_INTERN_LENGTH,
+    SUBJECT_PREFIX_REGEX,
+    compile_prefix_regex,
+    intern_content,
+    normalize_subject,
+    sanitize_html,
+)
+
+
+class TestSubjectPrefixRegex:
+    @pytest.mark.parametrize(
+        "subject, expected",
+        [
+            ("Re: Hello", "Hello"),
+            ("RE: re: Re:Hello", "Hello"),
+            # Numbered reply and forward prefixes
+            ("Re2: Fwd3: Hello", "Hello"),
+            # Other languages' prefixes
+            ("AW: SV: VS: Fw: Hello", "Hello"),
+            # Bracketed prefixes mixed with reply prefixes, in any order
+            ("Re: [group] Fwd: [other] Hello", "Hello"),
+            ("  [group]  Re:  Hello", "Hello"),
+            # Only the start of the subject is stripped
+            ("Hello Re: World", "Hello Re: World"),
+            ("Hello [group]", "Hello [group]"),
+            # Words that merely start like a prefix are kept
+            ("Really: Hello", "Really: Hello"),
+            ("Forward: Hello", "Forward: Hello"),
+        ],
+    )
+    def test_strips_prefix_run(self, subject: str, expected: str):
+        assert SUBJECT_PREFIX_REGEX.sub("", subject, count=1).strip() == expected
+
+    def test_escaped_prefixes(self):
+        # Plain-text prefixes are escaped by the caller, as base_message does
+        regex = compile_prefix_regex(["re:", r"a\.b:"])
+        assert regex.sub("", "Re: A.B: Hello", count=1) == "Hello"
+        assert regex.sub("", "AxB: Hello", count=1) == "AxB: Hello"
+
+    @pytest.mark.parametrize(
+        "subject, expected",
+        [
+            ("Re: Fwd: [group] Hello", "Hello"),
+            ("FW: Re: Hello", "Hello"),
+            ("Hello Re: World", "Hello Re: World"),
+        ],
+    )
+    def test_base_message_prefix_regex(self, subject: str, expected: str):
+        assert PREFIX_REGEX.sub("", subject, count=1).strip() == expected
+        assert BaseMessage._normalize_subject(subject) == expected
+
+
+class TestNormalizeSubject:
+    @pytest.mark.parametrize(
+        "subject, expected",
+        [
+            ("Re: [group] Meeting [2 Attachments]", "Meeting"),
+            ("New topic (was Re: [group] Old topic)", "Old topic"),
+            ("Re: [group]", DEFAULT_SUBJECT),
+            ("", DEFAULT_SUBJECT),
+        ],
+    )
+    def test_normalize_subject(self, subject: str, expected: str):
+        assert normalize_subject(subject) == expected
+
+
+class TestInternContent:
+    @staticmethod
+    def _body(n: int) -> str:
+        # Built at runtime so equal bodies are distinct objects, as after unpickling
+        return "".join(["x" * MIN_INTERN_LENGTH, str(n)])
+
+    def test_equal_bodies_are_shared(self, monkeypatch):
+        monkeypatch.setattr(message_utils, "_INTERNED_CONTENT", message_utils.OrderedDict())
+        first = intern_content(self._body(1))
+        second = self._body(1)
+        assert second is not first
+        assert intern_content(second) is first
+
+    def test_short_bodies_are_not_kept(self, monkeypatch):
+        monkeypatch.setattr(message_utils, "_INTERNED_CONTENT", message_utils.OrderedDict())
+        assert intern_content("short") == "short"
+        assert intern_content(None) is None
+        assert not message_utils._INTERNED_CONTENT
+
+    def test_table_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(message_utils, "_INTERNED_CONTENT", message_utils.OrderedDict())
+        monkeypatch.setattr(message_utils, "INTERN_TABLE_SIZE", 3)
+        first = intern_content(self._body(0))
+        for n in range(1, 5):
+            intern_content(self._body(n))
+        assert len(message_utils._INTERNED_CONTENT) == 3
+        # The least recently seen body was dropped
+        assert intern_content(self._body(0)) is not first
+
+
+class TestSanitizeHtml:
+    @pytest.mark.parametrize(
+        "body, expected",
+        [
+            # class survives on <div> and <span> only; style and event handlers never do
+            (
+                '<div class="a" id="b" style="color: red"><span class="c" onclick="x()">y</span></div>',
+                '<div class="a" id="b"><span class="c">y</span></div>',
+            ),
+            ('<p class="d" id="e" style="margin: 0">z</p>', '<p id="e">z</p>'),
+            # <font> is unwrapped, keeping its text
+            ('<font face="Arial" color="red">x</font>', "x"),
+            # Scripts, styles, titles, frames and objects are removed with their contents
+            (
+                "a<script>alert(1)</script><style>p {}</style><title>t</title>"
+                '<iframe src="x">f</iframe><object>o</object>b',
+                "ab",
+            ),
+            # Links keep href and title, with a rel added; unsafe URLs are dropped
+            (
+                '<a href="http://example.com/" title="t" target="_blank">l</a>',
+                '<a href="http://example.com/" title="t" rel="noopener noreferrer">l</a>',
+            ),
+            ('<a href="javascript:alert(1)">l</a>', '<a rel="noopener noreferrer">l</a>'),
+            ('<img src="x.png" alt="y" onerror="z()">', '<img src="x.png" alt="y">'),
+            # Tables, preformatted text and quotes are kept
+            (
+                "<table><tbody><tr><td>1</td></tr></tbody></table><pre><code>c</code></pre><blockquote>q</blockquote>",
+                "<table><tbody><tr><td>1</td></tr></tbody></table><pre><code>c</code></pre><blockquote>q</blockquote>",
+            ),
+            # Control characters lxml can't parse are stripped
+            ("a\x00b\x0bc", "abc"),
+        ],
+    )
+    def test_sanitized_html(self, body: str, expected: str):
+        assert sanitize_html(body)[0] == expected
+
+    def test_text_content(self):
+        assert sanitize_html("<p>Hello <b>world</b></p><script>x</script>") == (
+            "<p>Hello <b>world</b></p>",
+            "Hello world",
+        )
+
+    @pytest.mark.parametrize("body", ["", "   ", "<script>alert(1)</script>", "<style>p {}</style>"])
+    def test_empty_result(self, body: str):
+        assert sanitize_html(body) == ("", "")
@@ -0,0 +1,38 @@
+import pytest
+
+from parser.utils import PARSE_CHUNK_SIZE, parallel_map
+
+
+def _square(n: int) -> int:
+    return n * n
+
+
+def _fail_on_seven(n: int) -> int:
+    if n == 7:
+        raise ValueError("bad item 7")
+    return n
+
+
+class TestParallelMap:
+    def test_results_in_input_order(self):
+        # Enough items for several batches, so they are spread across workers
+        items = list(range(PARSE_CHUNK_SIZE * 5 + 3))
+        assert list(parallel_map(_square, items)) == [n * n for n in items]
+
+    def test_accepts_an_iterator(self):
+        assert list(parallel_map(_square, iter(range(10)))) == [n * n for n in range(10)]
+
+    def test_empty_input(self):
+        assert list(parallel_map(_square, [])) == []
+
+    def test_worker_exception_is_raised(self):
+        with pytest.raises(ValueError, match="bad item 7"):
+            list(parallel_map(_fail_on_seven, range(PARSE_CHUNK_SIZE * 2)))
+
+    def test_results_before_a_failing_batch_are_yielded(self):
+        results = parallel_map(_fail_on_seven, range(PARSE_CHUNK_SIZE * 2 + 7, -1, -1))
+        # The failing item is in the last batch, so the earlier batches come through first
+        first_batch = [next(results) for _ in range(PARSE_CHUNK_SIZE)]
+        assert first_batch == list(range(PARSE_CHUNK_SIZE * 2 + 7, PARSE_CHUNK_SIZE + 7, -1))
+        with pytest.raises(ValueError):
+            list(results)